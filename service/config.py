@@ -16,6 +16,9 @@ class Config:
 
     ELK_ENABLE = boolean(en("SERVICE_ELK_ENABLE", "FALSE"))
     SWAGGER_ENABLE = boolean(en("SERVICE_SWAGGER_ENABLE", "TRUE"))
+    RUN_MIGRATIONS_ON_STARTUP = boolean(
+        en("SERVICE_RUN_MIGRATIONS_ON_STARTUP", "FALSE")
+    )
 
     # ELK
     ELK_HOST = en("SERVICE_ELK_HOST", "localhost")
@@ -23,11 +26,22 @@ class Config:
     ELK_LEVEL = en("SERVICE_ELK_LEVEL", "INFO")
     ELK_LOGGER_NAME = en("SERVICE_ELK_LOGGER_NAME", "elk")
     ELK_SERVICE_NAME = en("SERVICE_ELK_SERVICE_NAME", "service")
+    ELK_QUEUE_SIZE = en("SERVICE_ELK_QUEUE_SIZE", "10000")
+    ELK_FLUSH_THRESHOLD = en("SERVICE_ELK_FLUSH_THRESHOLD", "0.3")
+    ELK_FLUSH_INTERVAL = en("SERVICE_ELK_FLUSH_INTERVAL", "0.05")
 
     # Postgres
     POSTGRES_DSN = en("SERVICE_POSTGRES_DSN", "")
-    POSTGRES_MIN_SIZE = en("SERVICE_POSTGRES_MIN_SIZE", "5")
-    POSTGRES_MAX_SIZE = en("SERVICE_POSTGRES_MAX_SIZE", "75")
+    POSTGRES_MIN_SIZE = en("SERVICE_POSTGRES_MIN_SIZE", "25")
+    POSTGRES_MAX_SIZE = en("SERVICE_POSTGRES_MAX_SIZE", "50")
+    POSTGRES_MAX_INACTIVE_CONNECTION_LIFETIME = en(
+        "SERVICE_POSTGRES_MAX_INACTIVE_CONNECTION_LIFETIME", "3600"
+    )
+    POSTGRES_STATEMENT_CACHE_SIZE = en("SERVICE_POSTGRES_STATEMENT_CACHE_SIZE", "1024")
+    POSTGRES_MAX_CACHED_STATEMENT_LIFETIME = en(
+        "SERVICE_POSTGRES_MAX_CACHED_STATEMENT_LIFETIME", "0"
+    )
+    POSTGRES_COMMAND_TIMEOUT = en("SERVICE_POSTGRES_COMMAND_TIMEOUT", "60")
 
     # Sentry
     SENTRY_ENABLE = boolean(en("SERVICE_SENTRY_ENABLE", "TRUE"))
@@ -1,28 +1,23 @@
 import orjson
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Iterable, List, Optional, Type, TypeVar
 from pydantic import BaseModel, Field
-from datetime import datetime, timezone
 
 
 def orjson_dumps(v, *, default=None):
-    # Add UTC timezone to datetime fields
-    for key, value in v.items():
-        # If it's a list of dicts
-        if isinstance(value, list):
-            for vv in value:
-                if isinstance(vv, dict):
-                    for kkey, vvalue in vv.items():
-                        if isinstance(vvalue, datetime):
-                            vv[kkey] = vvalue.replace(tzinfo=timezone.utc)
-        if isinstance(value, datetime):
-            v[key] = value.replace(tzinfo=timezone.utc)
-
-    # orjson.dumps returns bytes, to match standard json.dumps we need to decode
+    # Naive datetime fields are stored in UTC,
+    # so orjson adds UTC timezone to them during serialization.
+    # orjson.dumps returns bytes, they are sent to the client as is
     return orjson.dumps(
         v,
         default=default,
-        option=orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_UTC_Z,
-    ).decode()
+        option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_OMIT_MICROSECONDS,
+    )
+
+
+def orjson_dumps_str(v, *, default=None) -> str:
+    # pydantic .json() returns str, bytes are used only for responses
+    return orjson_dumps(v, default=default).decode()
 
 
 # Base class
@@ -30,7 +25,21 @@ class BaseClass(BaseModel):
     class Config:
         # Change default json encoders/decoders to orjson ones
         json_loads = orjson.loads
-        json_dumps = orjson_dumps
+        json_dumps = orjson_dumps_str
+
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def records_to_models(model: Type[Model], records: Iterable[dict]) -> List[Model]:
+    """
+    Create models from database records without validation.
+
+    :param model: pydantic model class.
+    :param records: database records, already checked by database schema.
+    :return: list of models.
+    """
+    return [model.construct(**record) for record in records]
 
 
 # Requests
@@ -55,46 +64,43 @@ class ResponseFailure(BaseClass):
 
 
 # Swagger examples
-class Examples(BaseClass):
-    class Config:
-        """Adds additional schema."""
-
-        schema_extra = {
-            "default": {
-                "400": {
-                    "description": "Bad Request.",
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": "#/components/schemas/ResponseFailure"},
-                            "examples": {
-                                "ResponseFailureDataFormat": {
-                                    "summary": "Bad Request Error.",
-                                    "value": {
-                                        "success": False,
-                                        "result": {
-                                            "error_type": "BadRequestError",
-                                            "error_message": "Bad Request Error.",
-                                        },
+# Built once and shared read-only by Examples schema
+ERROR_EXAMPLES = MappingProxyType(
+    {
+        "default": {
+            "400": {
+                "description": "Bad Request.",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/ResponseFailure"},
+                        "examples": {
+                            "ResponseFailureDataFormat": {
+                                "summary": "Bad Request Error.",
+                                "value": {
+                                    "success": False,
+                                    "result": {
+                                        "error_type": "BadRequestError",
+                                        "error_message": "Bad Request Error.",
                                     },
                                 },
                             },
                         },
                     },
                 },
-                "500": {
-                    "description": "Internal Server Error.",
-                    "content": {
-                        "application/json": {
-                            "schema": {"$ref": "#/components/schemas/ResponseFailure"},
-                            "examples": {
-                                "ResponseInternalServerError": {
-                                    "summary": "Internal Server Error.",
-                                    "value": {
-                                        "success": False,
-                                        "result": {
-                                            "error_type": "DatabaseError",
-                                            "error_message": "Database Connection Error.",
-                                        },
+            },
+            "500": {
+                "description": "Internal Server Error.",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/ResponseFailure"},
+                        "examples": {
+                            "ResponseInternalServerError": {
+                                "summary": "Internal Server Error.",
+                                "value": {
+                                    "success": False,
+                                    "result": {
+                                        "error_type": "DatabaseError",
+                                        "error_message": "Database Connection Error.",
                                     },
                                 },
                             },
@@ -102,4 +108,13 @@ class Examples(BaseClass):
                     },
                 },
             },
-        }
+        },
+    }
+)
+
+
+class Examples(BaseClass):
+    class Config:
+        """Adds additional schema."""
+
+        schema_extra = ERROR_EXAMPLES
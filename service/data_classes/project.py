@@ -1,10 +1,25 @@
 from uuid import UUID
 from datetime import datetime
-from pydantic import Field
-from typing import List, Optional
+from pydantic import Field, constr, validator
+from typing import Any, List, Optional
 
 from service.data_classes.base import BaseClass, Request, ResponseSuccess
 
+# Project UUID in canonical form.
+# Kept as a string: asyncpg accepts strings for uuid columns,
+#  so there is no need to create UUID objects for every ID in a request.
+ProjectId = constr(
+    regex=r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+)
+
+
+def lowercase_ids(cls, v: Any) -> Any:
+    """Lowercase project IDs before their format is checked."""
+    if isinstance(v, list):
+        return [i.lower() if isinstance(i, str) else i for i in v]
+
+    return v
+
 
 # Main data structures
 class Project(BaseClass):
@@ -29,6 +44,11 @@ class ProjectList(BaseClass):
     updated_gt: Optional[datetime] = Field(description="Updated Greater.")
     updated_lt: Optional[datetime] = Field(description="Updated Less.")
 
+    @validator("created_gt", "created_lt", "updated_gt", "updated_lt")
+    def remove_timezone(cls, v: Optional[datetime]) -> Optional[datetime]:
+        """Database stores naive datetime, so timezone is removed once here."""
+        return v.replace(tzinfo=None) if v else v
+
 
 # Requests
 class RequestProjectCreate(Request):
@@ -36,7 +56,9 @@ class RequestProjectCreate(Request):
 
 
 class RequestProjectRead(Request):
-    params: List[UUID] = Field(title="Project IDs.")
+    params: List[ProjectId] = Field(title="Project IDs.")
+
+    _lowercase_ids = validator("params", pre=True, allow_reuse=True)(lowercase_ids)
 
 
 class RequestProjectUpdate(Request):
@@ -44,7 +66,9 @@ class RequestProjectUpdate(Request):
 
 
 class RequestProjectDelete(Request):
-    params: List[UUID] = Field(title="Project IDs.")
+    params: List[ProjectId] = Field(title="Project IDs.")
+
+    _lowercase_ids = validator("params", pre=True, allow_reuse=True)(lowercase_ids)
 
 
 class RequestProjectList(Request):
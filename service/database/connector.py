@@ -1,9 +1,81 @@
+import functools
+import logging
+import re
+
 import asyncpgsa
 import orjson
 from asyncpg.pool import Pool
 from sqlalchemy.dialects import postgresql
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
+
+from service.data_classes.base import orjson_dumps
+
+# Query parameter placeholder: $1, $2, ...
+QUERY_PARAMETER = re.compile(r"\$(\d+)")
+
+# Binary jsonb format version
+JSONB_VERSION = b"\x01"
+
+
+def query_args(query) -> tuple:
+    """
+    Get asyncpg call arguments for a query.
+
+    :param query: SQLAlchemy statement or precompiled (sql, args) tuple.
+    :return: arguments for connection.fetch/fetchrow.
+    """
+    if isinstance(query, tuple):
+        sql, args = query
+        return (sql, *args)
+
+    return (query,)
+
+
+def join_boundaries(keys: Tuple[str, ...]) -> Tuple[int, ...]:
+    """Get indexes of columns which start joined tables: repeated column names."""
+    boundaries = []
+    table_keys = set()
+
+    for i, key in enumerate(keys):
+        if key in table_keys:
+            boundaries.append(i)
+            table_keys = set()
+
+        table_keys.add(key)
+
+    return tuple(boundaries)
+
+
+@functools.lru_cache(maxsize=None)
+def row_splitter(
+    keys: Tuple[str, ...], split_at: Tuple[int, ...]
+) -> Callable[[tuple], List[dict]]:
+    """
+    Build a function which splits row values into dicts of joined tables.
+    Functions are cached, so every query shape is handled with fixed slices.
+
+    :param keys: column names.
+    :param split_at: indexes of columns which start joined tables.
+    :return: splitter function.
+    """
+    bounds = (0, *split_at, len(keys))
+    tables = [(keys[a:b], a, b) for a, b in zip(bounds, bounds[1:])]
+
+    def split(values: tuple) -> List[dict]:
+        return [dict(zip(table, values[a:b])) for table, a, b in tables]
+
+    return split
+
+
+def jsonb_encode(value) -> bytes:
+    """Encode value into binary jsonb: version byte followed by json."""
+    return JSONB_VERSION + orjson.dumps(value)
+
+
+def jsonb_decode(value: bytes):
+    """Decode binary jsonb skipping the version byte."""
+    return orjson.loads(value[1:])
 
 
 class AbstractStorage(ABC):
@@ -56,6 +128,9 @@ class AsyncpgsaStorage(AbstractStorage):
         max_size: int = 10,
         max_queries: int = 50000,
         max_inactive_connection_lifetime: float = 300.0,
+        statement_cache_size: int = 100,
+        max_cached_statement_lifetime: float = 300.0,
+        command_timeout: float = None,
         logger=None,
     ):
         """
@@ -74,6 +149,12 @@ class AsyncpgsaStorage(AbstractStorage):
         :param max_inactive_connection_lifetime: Number of seconds after which
          inactive connections in the pool will be closed.
           Pass 0 to turn this off.
+        :param statement_cache_size: Size of prepared statements cache
+         of each connection. Pass 0 to turn this off.
+        :param max_cached_statement_lifetime: Number of seconds after which
+         cached prepared statements are removed.
+          Pass 0 to keep them for the whole connection life.
+        :param command_timeout: Default timeout of queries in seconds.
         :param logger: Logger object.
         """
         super().__init__()
@@ -90,6 +171,9 @@ class AsyncpgsaStorage(AbstractStorage):
         self.max_size = int(max_size)
         self.max_queries = int(max_queries)
         self.max_inactive_connection_lifetime = float(max_inactive_connection_lifetime)
+        self.statement_cache_size = int(statement_cache_size)
+        self.max_cached_statement_lifetime = float(max_cached_statement_lifetime)
+        self.command_timeout = float(command_timeout) if command_timeout else None
 
         self.logger = logger
 
@@ -122,6 +206,9 @@ class AsyncpgsaStorage(AbstractStorage):
             max_size=self.max_size,
             max_queries=self.max_queries,
             max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+            statement_cache_size=self.statement_cache_size,
+            max_cached_statement_lifetime=self.max_cached_statement_lifetime,
+            command_timeout=self.command_timeout,
             init=self.connection_init,
             # connection_class=SAConnection,
         )
@@ -145,6 +232,9 @@ class AsyncpgsaStorage(AbstractStorage):
                     "max_size": self.max_size,
                     "max_queries": self.max_queries,
                     "max_inactive_connection_lifetime": self.max_inactive_connection_lifetime,
+                    "statement_cache_size": self.statement_cache_size,
+                    "max_cached_statement_lifetime": self.max_cached_statement_lifetime,
+                    "command_timeout": self.command_timeout,
                 },
             )
 
@@ -174,38 +264,44 @@ class AsyncpgsaStorage(AbstractStorage):
     @staticmethod
     async def connection_init(connection) -> None:
         """Modify PostgreSQL connection."""
-        # Decode jsonb on arrival
+        # Encode and decode jsonb in binary format,
+        # so values aren't converted to text on both sides
         await connection.set_type_codec(
             "jsonb",
-            encoder=str,
-            decoder=orjson.loads,
+            encoder=jsonb_encode,
+            decoder=jsonb_decode,
             schema="pg_catalog",
+            format="binary",
         )
 
     async def log_query(self, query) -> None:
         """Log query."""
-        if self.logger:
-            try:
-                q, p = asyncpgsa.compile_query(query)
-
-                for i in range(len(p), 0, -1):
-                    q = q.replace(f"${i}", str(p[i - 1]))
-
-                q = q.replace("\n", " ")
+        # Don't render the query if it won't be logged
+        if not self.logger or not self.logger.is_enabled_for(logging.INFO):
+            return
 
-                table = q.split('"')[1]
-                query = q
-            except:
-                table = None
+        try:
+            if isinstance(query, tuple):
+                q, p = query
+            else:
+                q, p = asyncpgsa.compile_query(query)
 
-            await self.logger.info(
-                msg="Executing query on PostgreSQL",
-                extra={
-                    "type": "DatabaseQuery",
-                    "table": table,
-                    "query": query,
-                },
-            )
+            q = QUERY_PARAMETER.sub(lambda m: str(p[int(m.group(1)) - 1]), q)
+            q = q.replace("\n", " ")
+
+            table = q.split('"')[1]
+            query = q
+        except:
+            table = None
+
+        await self.logger.info(
+            msg="Executing query on PostgreSQL",
+            extra={
+                "type": "DatabaseQuery",
+                "table": table,
+                "query": query,
+            },
+        )
 
     async def fetch(self, query, connection=None) -> list:
         """Fetch several rows."""
@@ -213,10 +309,10 @@ class AsyncpgsaStorage(AbstractStorage):
 
         # If it is a transaction
         if connection:
-            results = await connection.fetch(query)
+            results = await connection.fetch(*query_args(query))
         else:
             async with self.connection.acquire() as conn:
-                results = await conn.fetch(query)
+                results = await conn.fetch(*query_args(query))
 
         return [dict(row) for row in results] if results else []
 
@@ -226,33 +322,80 @@ class AsyncpgsaStorage(AbstractStorage):
 
         # If it is a transaction
         if connection:
-            results = await connection.fetchrow(query)
+            results = await connection.fetchrow(*query_args(query))
         else:
             async with self.connection.acquire() as conn:
-                results = await conn.fetchrow(query)
+                results = await conn.fetchrow(*query_args(query))
 
         return dict(results) if results else {}
 
-    async def fetchfulljoin(self, query, connection=None) -> List[List[dict]]:
-        """Fetch several rows and transform the results."""
+    async def fetch_json(self, query, connection=None) -> bytes:
+        """
+        Fetch several rows as a JSON array.
+        Rows are read with a server-side cursor and serialized one by one,
+         so neither a list of rows nor pydantic models are created.
+        Passed connection should be inside a transaction.
+        """
+        await self.log_query(query)
+
+        if isinstance(query, tuple):
+            sql, params = query
+        else:
+            sql, params = asyncpgsa.compile_query(query)
+
+        # If it is a transaction
+        if connection:
+            return await self.cursor_to_json(connection, sql, params)
+
+        async with self.connection.acquire() as conn:
+            async with conn.transaction():
+                return await self.cursor_to_json(conn, sql, params)
+
+    @staticmethod
+    async def cursor_to_json(connection, sql: str, params: list) -> bytes:
+        """Serialize rows of a server-side cursor into a JSON array."""
+        buffer = bytearray(b"[")
+
+        async for row in connection.cursor(sql, *params):
+            if len(buffer) > 1:
+                buffer += b","
+
+            buffer += orjson_dumps(dict(row), default=str)
+
+        buffer += b"]"
+
+        return bytes(buffer)
+
+    async def fetchfulljoin(
+        self, query, connection=None, split_at: Tuple[int, ...] = None
+    ) -> List[List[dict]]:
+        """
+        Fetch several rows and transform the results.
+        Each row is split into dicts of joined tables.
+
+        :param query: query.
+        :param connection: connection of a transaction.
+        :param split_at: indexes of columns which start joined tables.
+         By default a table starts on the first repeated column name.
+        :return: list of rows split into dicts.
+        """
         await self.log_query(query)
 
         # If it is a transaction
         if connection:
-            results = await connection.fetch(query)
+            results = await connection.fetch(*query_args(query))
         else:
             async with self.connection.acquire() as conn:
-                results = await conn.fetch(query)
+                results = await conn.fetch(*query_args(query))
 
-        processed_results = []
-        for result in results:
-            temp = [{}]
-            for key, value in result.items():
-                if key in temp[-1]:
-                    temp.append({})
+        if not results:
+            return []
 
-                temp[-1][key] = value
+        # All rows have the same columns, so the split is computed once
+        keys = tuple(results[0].keys())
+        if split_at is None:
+            split_at = join_boundaries(keys)
 
-            processed_results.append(temp)
+        split = row_splitter(keys, tuple(split_at))
 
-        return processed_results
+        return [split(tuple(result)) for result in results]
@@ -1,7 +1,10 @@
+import functools
 import uuid
 from datetime import datetime
+from typing import Callable, Tuple
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import UUID
 
 metadata = sa.MetaData()
@@ -14,3 +17,78 @@ project = sa.Table(
     sa.Column("created", sa.TIMESTAMP, nullable=False, default=datetime.utcnow),
     sa.Column("updated", sa.TIMESTAMP, nullable=True, onupdate=datetime.utcnow),
 )
+
+
+def precompile(statement) -> Callable[..., Tuple[str, tuple]]:
+    """
+    Render SQLAlchemy statement into asyncpg SQL once.
+    Column defaults are not applied, all values should be passed explicitly.
+
+    :param statement: statement with named bind parameters.
+    :return: function which takes bind parameters by name
+     and returns (sql, args) tuple accepted by Storage.fetch/fetchrow.
+    """
+    compiled = statement.compile(dialect=postgresql.dialect())
+
+    names = tuple(compiled.params)
+    sql = compiled.string % {name: f"${i}" for i, name in enumerate(names, start=1)}
+
+    def bind(**values) -> Tuple[str, tuple]:
+        return sql, tuple(values[name] for name in names)
+
+    return bind
+
+
+# Precompiled project statements
+project_insert = precompile(
+    project.insert()
+    .values(
+        id=sa.bindparam("project_id"),
+        name=sa.bindparam("project_name"),
+        created=sa.bindparam("project_created"),
+    )
+    .returning(sa.literal_column("*"))
+)
+
+project_select = precompile(
+    project.select().where(project.c.id == sa.func.any(sa.bindparam("project_ids")))
+)
+
+project_update = precompile(
+    project.update()
+    .where(project.c.id == sa.bindparam("project_id"))
+    .values(
+        name=sa.bindparam("project_name"),
+        updated=sa.bindparam("project_updated"),
+    )
+    .returning(sa.literal_column("*"))
+)
+
+project_delete = precompile(
+    project.delete().where(project.c.id == sa.func.any(sa.bindparam("project_ids")))
+)
+
+# Project list filters, bind parameters are named after the filters
+project_list_filters = {
+    "created_gt": project.c.created > sa.bindparam("created_gt"),
+    "created_lt": project.c.created < sa.bindparam("created_lt"),
+    "updated_gt": project.c.updated > sa.bindparam("updated_gt"),
+    "updated_lt": project.c.updated < sa.bindparam("updated_lt"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def project_list(filters: Tuple[str, ...]) -> Callable[..., Tuple[str, tuple]]:
+    """
+    Get precompiled project list statement.
+    Every combination of filters is compiled once.
+
+    :param filters: sorted names of used filters.
+    :return: precompiled statement.
+    """
+    query = project.select()
+
+    for name in filters:
+        query = query.where(project_list_filters[name])
+
+    return precompile(query.order_by(project.c.created.desc()))
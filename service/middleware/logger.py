@@ -1,6 +1,9 @@
+import asyncio
 import logging
 import socket
-from typing import Union
+import sys
+import traceback
+from typing import List, Union
 
 from aiologstash import create_tcp_handler
 
@@ -10,9 +13,59 @@ class LogstashConnectionError(Exception):
 
 
 class CustomLogger(logging.Logger):
-    def _log(self, level, msg, args, exc_info=None, extra=None):
-        extra = {"extras": extra}
-        super(CustomLogger, self)._log(level, msg, args, exc_info, extra)
+    def makeRecord(
+        self,
+        name,
+        level,
+        fn,
+        lno,
+        msg,
+        args,
+        exc_info,
+        func=None,
+        extra=None,
+        sinfo=None,
+    ):
+        # Put extra in a single attribute of the record
+        record = super(CustomLogger, self).makeRecord(
+            name, level, fn, lno, msg, args, exc_info, func, None, sinfo
+        )
+        record.extras = extra
+
+        return record
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler which writes a batch of records at once."""
+
+    def handle_batch(self, records: List[logging.LogRecord]):
+        """
+        Format records and write them with a single write and flush.
+
+        :param records: log records.
+        """
+        lines = []
+
+        for record in records:
+            if record.levelno < self.level or not self.filter(record):
+                continue
+
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+
+        if not lines:
+            return
+
+        self.acquire()
+        try:
+            self.stream.write("".join(lines))
+            self.flush()
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
 
 
 class ELKAsync:
@@ -20,6 +73,9 @@ class ELKAsync:
 
     tcp_handler = None
     logger = None
+    queue = None
+    flush_event = None
+    flush_task = None
 
     def __init__(
         self,
@@ -29,6 +85,9 @@ class ELKAsync:
         level: Union[int, str] = "INFO",
         logger_name: str = "nlab.elk",
         enable: bool = True,
+        queue_size: int = 10000,
+        flush_threshold: float = 0.3,
+        flush_interval: float = 0.05,
     ):
         """
         Async Logstash/stderr logger.
@@ -39,6 +98,11 @@ class ELKAsync:
         :param service_name: service name.
         :param logger_name: logger name.
         :param enable: enable Logstash logger.
+        :param queue_size: maximum number of records waiting to be handled.
+         The oldest records are dropped when the queue is full.
+        :param flush_threshold: part of the queue which should be filled
+         to handle queued records before flush_interval ends.
+        :param flush_interval: seconds between handling of queued records.
         """
 
         self.service_name = service_name
@@ -47,6 +111,9 @@ class ELKAsync:
         self.level = level
         self.logger_name = logger_name
         self.enable_logstash = enable
+        self.queue_size = int(queue_size)
+        self.flush_threshold = max(1, int(self.queue_size * float(flush_threshold)))
+        self.flush_interval = float(flush_interval)
 
         if not self.service_name:
             raise RuntimeWarning("Service name empty.")
@@ -73,7 +140,7 @@ class ELKAsync:
 
         logger.handlers = []
 
-        stream = logging.StreamHandler()
+        stream = BatchStreamHandler()
         stream.setFormatter(
             logging.Formatter(
                 fmt="%(asctime)-30s %(levelname)-10s %(message)s %(extras)s",
@@ -110,8 +177,26 @@ class ELKAsync:
 
         self.logger = logger
 
+        # Records are handled in background, off the request path
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.flush_event = asyncio.Event()
+        self.flush_task = asyncio.ensure_future(self.flush_loop())
+
     async def connection_close(self):
         """Close connection to Logstash."""
+        if self.flush_task:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+
+            # Handle records left in the queue
+            self.flush()
+            self.queue = None
+            self.flush_event = None
+
         if self.tcp_handler:
             self.tcp_handler.close()
             await self.tcp_handler.wait_closed()
@@ -124,26 +209,93 @@ class ELKAsync:
                 },
             )
 
+    def is_enabled_for(self, level: int) -> bool:
+        """Check if a message with the level would be logged."""
+        return bool(self.logger) and self.logger.isEnabledFor(level)
+
+    async def flush_loop(self):
+        """
+        Handle queued records in batches:
+         when the queue is filled up to the threshold or the interval ends.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self.flush_event.clear()
+
+            # The loop should keep running, otherwise records are never handled
+            try:
+                self.flush()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def flush(self):
+        """Handle all queued records."""
+        records = []
+        while not self.queue.empty():
+            records.append(self.queue.get_nowait())
+
+        if not records:
+            return
+
+        for handler in self.logger.handlers:
+            # Batch is written to stderr at once
+            if isinstance(handler, BatchStreamHandler):
+                handler.handle_batch(records)
+                continue
+
+            for record in records:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def enqueue(self, level: int, msg, extra=None, exc_info=None):
+        """Create a log record and put it in the queue."""
+        if not self.is_enabled_for(level):
+            return
+
+        record = self.logger.makeRecord(
+            self.logger.name,
+            level,
+            "(unknown file)",
+            0,
+            msg,
+            (),
+            exc_info,
+            extra=extra,
+        )
+
+        # Queue is not created yet or already closed
+        if not self.queue:
+            self.logger.handle(record)
+            return
+
+        # Drop the oldest record
+        if self.queue.full():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait(record)
+
+        # Wake up the flush loop only when the threshold is crossed
+        if self.queue.qsize() == self.flush_threshold:
+            self.flush_event.set()
+
     async def debug(self, msg, extra=None):
-        if self.logger:
-            self.logger.debug(msg=msg, extra=extra)
+        self.enqueue(logging.DEBUG, msg, extra)
 
     async def info(self, msg, extra=None):
-        if self.logger:
-            self.logger.info(msg=msg, extra=extra)
+        self.enqueue(logging.INFO, msg, extra)
 
     async def warning(self, msg, extra=None):
-        if self.logger:
-            self.logger.warning(msg=msg, extra=extra)
+        self.enqueue(logging.WARNING, msg, extra)
 
     async def error(self, msg, extra=None):
-        if self.logger:
-            self.logger.error(msg=msg, extra=extra)
+        self.enqueue(logging.ERROR, msg, extra)
 
     async def exception(self, msg, extra=None):
-        if self.logger:
-            self.logger.exception(msg=msg, extra=extra)
+        self.enqueue(logging.ERROR, msg, extra, exc_info=sys.exc_info())
 
     async def critical(self, msg, extra=None):
-        if self.logger:
-            self.logger.critical(msg=msg, extra=extra)
+        self.enqueue(logging.CRITICAL, msg, extra)
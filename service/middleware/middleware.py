@@ -1,18 +1,166 @@
+import itertools
+import json
+import os
+import secrets
 import time
-import uuid
-from typing import Any
+from typing import Any, Callable, Dict, Union
 
+import orjson
 from aiohttp import web
 from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.json import pydantic_encoder
+from pydantic.utils import ROOT_KEY
+
+from service.data_classes.base import orjson_dumps
 
 from service.middleware.logger import ELKAsync
-from service.middleware.data_classes import ErrorResult, ResponseFailure
 from service.middleware.exceptions import BadRequestError
-from service.middleware.utils import (
-    log_error,
-    log_request,
-    log_response,
-)
+from service.middleware.utils import log_error, log_response
+
+# Request IDs are a per-process prefix and a counter.
+# Containers run the service as PID 1, so the prefix has a random part
+#  to keep IDs unique between replicas and restarts.
+request_id_prefix = ""
+request_counter = itertools.count()
+
+# Validation errors are sent as single-line json with single quotes,
+#  separators are the ones of e.json(indent=0) with newlines removed
+SINGLE_QUOTES = str.maketrans({'"': "'"})
+VALIDATION_SEPARATORS = (",", ": ")
+
+
+def reset_request_ids() -> None:
+    """Create a new request ID prefix and restart the counter."""
+    global request_id_prefix, request_counter
+
+    request_id_prefix = f"{secrets.token_hex(4)}-{os.getpid():x}-"
+    request_counter = itertools.count()
+
+
+def next_request_id() -> str:
+    """Get ID for the next request."""
+    return f"{request_id_prefix}{next(request_counter):x}"
+
+
+# Each process gets its own prefix, forked workers included
+reset_request_ids()
+os.register_at_fork(after_in_child=reset_request_ids)
+
+
+def error_payload(exception: Exception) -> dict:
+    """
+    Build ResponseFailure payload for the exception.
+    A plain dict is used to skip pydantic validation on error paths.
+
+    :param exception: caught exception.
+    :return: ResponseFailure shaped dict.
+    """
+    return {
+        "success": False,
+        "result": {
+            "error_type": type(exception).__name__,
+            "error_message": str(exception),
+        },
+    }
+
+
+def model_encoder(obj: Any) -> Any:
+    """
+    orjson default function.
+    Fields of pydantic models are stored in __dict__,
+     so models are serialized without .dict() copying.
+
+    :param obj: object not supported by orjson.
+    :return: serializable object.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+
+    return pydantic_encoder(obj)
+
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    """
+    Create JSON response serialized with orjson.
+    orjson produces bytes, so the body is encoded only once.
+
+    :param data: data to be serialized, including pydantic models.
+    :param status: HTTP status code.
+    :return: web.Response object.
+    """
+    body = orjson_dumps(data, default=model_encoder)
+
+    return web.Response(
+        body=body,
+        status=status,
+        content_type="application/json",
+        headers={"Content-Length": str(len(body))},
+    )
+
+
+def build_data_parser(annotation: Any) -> Callable[[bytes], BaseModel]:
+    """
+    Build a function which puts raw request body into handler data annotation.
+
+    :param annotation: pydantic class or Union of pydantic classes.
+    :return: parser function.
+    """
+
+    # Union of several classes
+    if getattr(annotation, "__origin__", None) is Union:
+        # Getting classes from Union
+        classes: tuple = annotation.__args__
+
+        def parse_union(body: bytes) -> BaseModel:
+            request_json = orjson.loads(body)
+            data = None
+            matched_classes_number: int = 0
+            validation_error: str = ""
+
+            # Attempt to put incoming data in all classes in the union
+            for single_class in classes:
+                try:
+                    data = single_class(**request_json)
+                    matched_classes_number += 1
+                except ValidationError as e:
+                    validation_error = str(e)
+
+            # If failed to match any of the classes, raise the last validation error
+            if matched_classes_number == 0:
+                raise BadRequestError(validation_error)
+            # If matched several classes
+            elif matched_classes_number > 1:
+                raise BadRequestError(
+                    "Request matches several of the classes in the union."
+                )
+
+            return data
+
+        return parse_union
+
+    # Usually handlers should use pydantic class as an annotation
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+
+        def parse_model(body: bytes) -> BaseModel:
+            # orjson reads bytes directly, parse_raw would decode them to str first
+            try:
+                request_json = orjson.loads(body)
+            except orjson.JSONDecodeError as e:
+                # Same error as parse_raw raises for invalid json
+                raise ValidationError([ErrorWrapper(e, loc=ROOT_KEY)], annotation)
+
+            return annotation.parse_obj(request_json)
+
+        return parse_model
+
+    raise BadRequestError(
+        "Handler data annotation is not a subclass of pydantic.BaseModel."
+    )
+
+
+# Parsers are built once per data annotation and reused by all requests
+data_parsers: Dict[Any, Callable[[bytes], BaseModel]] = {}
 
 
 class MiddlewareMain:
@@ -30,7 +178,7 @@ class MiddlewareMain:
         :return: response object or an aiohttp exception.
         """
 
-        req_id = uuid.uuid4()
+        req_id = next_request_id()
 
         # Get logger object
         if (
@@ -40,69 +188,63 @@ class MiddlewareMain:
         ):
             logger = request.app["ELKAsync"]
 
-        try:
-            await log_request(request, req_id, logger=logger)
-            time_begin = time.time()
+        # Request and response are logged together when the request is done
+        time_begin = time.perf_counter()
 
+        try:
             response = await handler(request)
 
-            time_end = time.time() - time_begin
+            time_end = time.perf_counter() - time_begin
             await log_response(request, req_id, response, time_end, logger=logger)
 
             return response
         # 401: Unauthorized
         except web.HTTPUnauthorized as e:
-            response = ResponseFailure(
-                result=ErrorResult(
-                    error_type=type(e).__name__,
-                    error_message=str(e),
-                ),
-            )
+            response = error_payload(e)
+            time_end = time.perf_counter() - time_begin
 
-            await log_error(request, req_id, response, 401, exception=e, logger=logger)
+            await log_error(
+                request, req_id, response, 401, time_end, exception=e, logger=logger
+            )
 
             raise web.HTTPUnauthorized(
-                text=response.json(), content_type="application/json"
+                body=orjson.dumps(response), content_type="application/json"
             )
         # 400: BadRequest
         except BadRequestError as e:
-            response = ResponseFailure(
-                result=ErrorResult(
-                    error_type=type(e).__name__,
-                    error_message=str(e),
-                ),
-            )
+            response = error_payload(e)
+            time_end = time.perf_counter() - time_begin
 
-            await log_error(request, req_id, response, 400, exception=e, logger=logger)
+            await log_error(
+                request, req_id, response, 400, time_end, exception=e, logger=logger
+            )
 
             raise web.HTTPBadRequest(
-                text=response.json(), content_type="application/json"
+                body=orjson.dumps(response), content_type="application/json"
             )
         # 200: User Exceptions
         except UserWarning as e:
-            response = ResponseFailure(
-                result=ErrorResult(
-                    error_type=type(e).__name__,
-                    error_message=str(e),
-                ),
-            )
+            response = error_payload(e)
+            time_end = time.perf_counter() - time_begin
 
-            await log_error(request, req_id, response, 200, exception=e, logger=logger)
+            await log_error(
+                request, req_id, response, 200, time_end, exception=e, logger=logger
+            )
 
-            raise web.HTTPOk(text=response.json(), content_type="application/json")
+            raise web.HTTPOk(
+                body=orjson.dumps(response), content_type="application/json"
+            )
         # 500: InternalServerError
         except Exception as e:
-            response = ResponseFailure(
-                result=ErrorResult(
-                    error_type=type(e).__name__,
-                    error_message=str(e),
-                ),
-            )
+            response = error_payload(e)
+            time_end = time.perf_counter() - time_begin
 
-            await log_error(request, req_id, response, 500, exception=e, logger=logger)
+            await log_error(
+                request, req_id, response, 500, time_end, exception=e, logger=logger
+            )
 
             raise web.HTTPInternalServerError(
-                text=response.json(), content_type="application/json"
+                body=orjson.dumps(response), content_type="application/json"
             )
 
     @staticmethod
@@ -111,8 +253,8 @@ class MiddlewareMain:
         """
         Middleware that takes json payload from incoming requests,
          validates it and sends back data received from handlers.
-        This middleware expects all responses to be pydantic dataclasses
-         or data structures implementing .json() method.
+        pydantic responses are serialized with json_response (orjson and
+         model_encoder), other responses are returned as they are.
         Removal of this middleware removes validation of data
          and breaks logic of handlers.
 
@@ -125,45 +267,19 @@ class MiddlewareMain:
         if "data" in handler.__annotations__:
             try:
                 annotation = handler.__annotations__["data"]
-                request_json = await request.json()
 
-                try:
-                    # Usually handlers should use pydantic class as an annotation
-                    if issubclass(annotation, BaseModel):
-                        request["data"] = annotation(**request_json)
-                    else:
-                        raise BadRequestError(
-                            "Handler data annotation is not a subclass of pydantic.BaseModel."
-                        )
-                # issubclass(..., Union[...]) throws TypeError
-                except TypeError:
-                    # Getting classes from Union
-                    classes: tuple = annotation.__args__
-                    matched_classes_number: int = 0
-                    validation_error: str = ""
-
-                    # Attempt to put incoming data in all classes in the union
-                    for single_class in classes:
-                        try:
-                            request["data"] = single_class(**request_json)
-                            matched_classes_number += 1
-                        except ValidationError as e:
-                            validation_error = str(e)
-
-                    # If failed to match any of the classes, raise the last validation error
-                    if matched_classes_number == 0:
-                        raise BadRequestError(validation_error)
-                    # Everything is fine
-                    elif matched_classes_number == 1:
-                        pass
-                    # If matched several classes
-                    else:
-                        raise BadRequestError(
-                            "Request matches several of the classes in the union."
-                        )
+                parser = data_parsers.get(annotation)
+                if parser is None:
+                    parser = data_parsers[annotation] = build_data_parser(annotation)
+
+                request["data"] = parser(await request.read())
             except ValidationError as e:
                 raise BadRequestError(
-                    e.json(indent=0).replace("\n", "").replace('"', "'")
+                    json.dumps(
+                        e.errors(),
+                        separators=VALIDATION_SEPARATORS,
+                        default=pydantic_encoder,
+                    ).translate(SINGLE_QUOTES)
                 )
             except Exception as e:
                 raise BadRequestError(str(e))
@@ -173,7 +289,7 @@ class MiddlewareMain:
         response = await handler(request)
 
         if isinstance(response, BaseModel):
-            return web.json_response(text=response.json())
+            return json_response(response)
 
         # No need to wrap response
         return response
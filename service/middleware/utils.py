@@ -1,173 +1,159 @@
-import json
+import logging
 import traceback
-from typing import Any
-from uuid import UUID
-
 import orjson
 from aiohttp import web
 
 from service.middleware.logger import ELKAsync
-from service.middleware.data_classes import (
-    ResponseFailure,
-    ELKErrorLog,
-    ELKRequestLog,
-    ELKResponseLog,
-)
 
 
-async def get_request_body(request: Any, max_length: int = 0):
+async def get_request_body(request: web.BaseRequest, max_length: int = 0):
     """Get decoded json or body from the request."""
 
-    body = ""
+    text = ""
 
     # Aiohttp
-    if hasattr(request, "text"):
-        body = await request.text()
+    if isinstance(request, web.BaseRequest):
+        text = await request.text()
+
+    # Long bodies are logged as cut text, there is no need to parse them
+    if 0 < max_length < len(text):
+        return text[:max_length] + "..."
 
     try:
-        body = orjson.loads(body)
+        return orjson.loads(text)
     except Exception:
-        pass
+        return text
 
-    if 0 < max_length < len(str(body)):
-        body = str(body)[:max_length] + "..."
-
-    return body
 
-
-async def get_response_body(response: Any, max_length: int = 0):
+async def get_response_body(response: web.StreamResponse, max_length: int = 0):
     """Get decoded json or body from the response."""
 
     body = ""
 
-    # Aiohttp
-    if hasattr(response, "text"):
+    # Aiohttp, stream responses have no body to log
+    if isinstance(response, web.Response):
         try:
-            body = json.loads(response.text)
-        except json.JSONDecodeError:
+            # Long bodies are logged as cut text, there is no need to parse them
+            if max_length > 0:
+                text = response.text or ""
+                if len(text) > max_length:
+                    return text[:max_length] + "..."
+
+            # Parse body bytes directly, without decoding them to str first
+            if isinstance(response.body, bytes):
+                body = orjson.loads(response.body)
+            else:
+                body = orjson.loads(response.text)
+        except orjson.JSONDecodeError:
             body = response.text
         except Exception:
             body = ""
 
-    if 0 < max_length < len(str(body)):
-        body = str(body)[:max_length] + "..."
-
     return body
 
 
-async def get_response_status_code(response: Any):
+async def get_response_status_code(response: web.StreamResponse):
     """Get status code from the response."""
     status_code = None
 
     # Aiohttp response
-    if hasattr(response, "status"):
+    if isinstance(response, web.StreamResponse):
         status_code = response.status
 
     return status_code
 
 
-async def log_request(
-    request: web.Request, req_id: UUID, logger: ELKAsync = None
-) -> None:
-    """
-    Log request in ELK.
+def get_request_info(request: web.Request) -> dict:
+    """Get request fields shared by all ELK records."""
 
-    :param request: request object.
-    :param req_id: request uuid.
-    :param logger: ELKAsync logger.
-    """
+    # Remove Authorization header from logs, header names are case-insensitive
+    headers = {
+        key: value
+        for key, value in request.headers.items()
+        if key.lower() != "authorization"
+    }
 
-    if logger:
-        # Remove Authorization header from logs
-        headers = dict(request.headers)
-        headers.pop("Authorization", None)
+    cookies = request.cookies
 
-        await logger.info(
-            msg=f"Request #{req_id}",
-            extra=ELKRequestLog(
-                **{
-                    "type": "Request",
-                    "request_uuid": str(req_id),
-                    "url": str(request.url),
-                    "method": request.method,
-                    "body": await get_request_body(request),
-                    "headers": headers,
-                    "cookies": dict(request.cookies),
-                },
-            ).dict(),
-        )
+    return {
+        "url": str(request.url),
+        "method": request.method,
+        "headers": headers,
+        "cookies": dict(cookies) if cookies else {},
+    }
 
 
 async def log_response(
     request: web.Request,
-    req_id: UUID,
+    req_id: str,
     response: web.Response,
     execution_time: float,
     logger: ELKAsync = None,
 ) -> None:
     """
-    Log response in ELK.
+    Log request and response in ELK as a single record.
 
     :param request: request object.
-    :param req_id: request uuid.
+    :param req_id: request id.
     :param response: response object.
     :param execution_time: time elapsed since handler was called.
     :param logger: ELKAsync logger.
     """
 
-    if logger:
+    # Don't read and parse bodies if the record won't be logged
+    if logger and logger.is_enabled_for(logging.INFO):
         await logger.info(
             msg=f"Response #{req_id}",
-            extra=ELKResponseLog(
-                **{
-                    "type": "Response",
-                    "request_uuid": str(req_id),
-                    "url": str(request.url),
-                    "method": request.method,
-                    "body": await get_response_body(response),
-                    "status_code": await get_response_status_code(response),
-                    "execution_time": execution_time,
-                },
-            ).dict(),
+            extra={
+                "type": "Response",
+                "request_uuid": req_id,
+                **get_request_info(request),
+                # Body of Response records is the response body
+                "body": await get_response_body(response),
+                "request_body": await get_request_body(request),
+                "status_code": await get_response_status_code(response),
+                "execution_time": execution_time,
+            },
         )
 
 
 async def log_error(
     request: web.Request,
-    req_id: UUID,
-    response: ResponseFailure,
+    req_id: str,
+    response: dict,
     status_code: int,
+    execution_time: float,
     exception: Exception = None,
     logger: ELKAsync = None,
 ) -> None:
     """
-    Log error in ELK.
+    Log request and error in ELK as a single record.
 
     :param request: request object.
-    :param req_id: request uuid.
-    :param response: response object.
+    :param req_id: request id.
+    :param response: ResponseFailure payload.
     :param status_code: response status code.
+    :param execution_time: time elapsed since handler was called.
     :param exception: caught exception.
     :param logger: ELKAsync logger.
     """
 
-    if logger:
+    # Don't read and parse bodies if the record won't be logged
+    if logger and logger.is_enabled_for(logging.ERROR):
         tb = None
         if exception:
             tb = "".join(traceback.format_tb(exception.__traceback__))
 
         await logger.error(
             msg=f"Error #{req_id}",
-            extra=ELKErrorLog(
-                **{
-                    "type": "Error",
-                    "request_uuid": str(req_id),
-                    "url": str(request.url),
-                    "method": request.method,
-                    "body": await get_request_body(request),
-                    "status_code": status_code,
-                    "error_info": response.dict(),
-                    "traceback": tb,
-                },
-            ).dict(),
+            extra={
+                "type": "Error",
+                "request_uuid": req_id,
+                **get_request_info(request),
+                "body": await get_request_body(request),
+                "status_code": status_code,
+                "execution_time": execution_time,
+                "error_info": response,
+                "traceback": tb,
+            },
         )
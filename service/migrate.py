@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config as AConfig
+
+from service.config import Config
+
+
+def migrate() -> None:
+    """Upgrade database to the latest Alembic revision."""
+    alembic_config = AConfig(Path(__file__).parent.parent / "alembic.ini")
+    alembic_config.set_main_option(
+        "script_location", str(Path(__file__).parent.parent / "alembic")
+    )
+    alembic_config.set_main_option("sqlalchemy.url", Config.POSTGRES_DSN)
+    command.upgrade(alembic_config, "head")
+
+
+def main() -> None:
+    """Run migrations once during deploy, before service processes start."""
+    migrate()
+
+
+if __name__ == "__main__":
+    main()
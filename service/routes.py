@@ -4,6 +4,28 @@ from service.swagger.swagger import update_function_docstring_with_swagger
 from service.routing import health_check
 from service.routing.v1 import project
 
+V1_FUNCTIONS = (
+    # Project
+    ("/create", project.create),
+    ("/read", project.read),
+    ("/update", project.update),
+    ("/delete", project.delete),
+    ("/list", project.lst),
+)
+
+MISC_FUNCTIONS = (("/health_check", health_check.health_check),)
+
+# Routes are created once on import.
+# web.post(...) is a frozen structure,
+# so we need to modify functions before its creation
+V1_ROUTES = [
+    web.post(path, update_function_docstring_with_swagger(func))
+    for path, func in V1_FUNCTIONS
+]
+
+# Misc handlers have swagger schema in their docstrings already
+MISC_ROUTES = [web.get(path, func) for path, func in MISC_FUNCTIONS]
+
 
 def get_routes_v1():
     """
@@ -12,24 +34,7 @@ def get_routes_v1():
     :return: aiohttp routes definitions.
     """
 
-    functions = [
-        # Project
-        ("/create", project.create),
-        ("/read", project.read),
-        ("/update", project.update),
-        ("/delete", project.delete),
-        ("/list", project.lst),
-    ]
-
-    routes = []
-    for path, func in functions:
-        func = update_function_docstring_with_swagger(func)
-
-        # web.post(...) is a frozen structure,
-        # so we need to modify functions before its creation
-        routes.append(web.post(path, func))
-
-    return routes
+    return list(V1_ROUTES)
 
 
 def get_routes_misc():
@@ -39,14 +44,4 @@ def get_routes_misc():
     :return: aiohttp routes definitions.
     """
 
-    functions = [("/health_check", health_check.health_check)]
-
-    routes = []
-    for path, func in functions:
-        func = update_function_docstring_with_swagger(func)
-
-        # web.post(...) is a frozen structure,
-        # so we need to modify functions before its creation
-        routes.append(web.get(path, func))
-
-    return routes
+    return list(MISC_ROUTES)
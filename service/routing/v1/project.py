@@ -1,9 +1,18 @@
-import sqlalchemy as sa
+import uuid
+from datetime import datetime
+
 from aiohttp import web
 from aiojobs.aiohttp import atomic
 
+from service.data_classes.base import records_to_models
 from service.data_classes.project import *
-from service.database.tables import project
+from service.database.tables import (
+    project_delete,
+    project_insert,
+    project_list,
+    project_select,
+    project_update,
+)
 from service.database.connector import AsyncpgsaStorage
 
 
@@ -17,9 +26,11 @@ async def create(
     data: RequestProjectCreate = data or request["data"]
     storage: AsyncpgsaStorage = request.app["Storage"]
 
-    values = data.params.dict()
-
-    query = project.insert().values(**values).returning(sa.literal_column("*"))
+    query = project_insert(
+        project_id=uuid.uuid4(),
+        project_name=data.params.name,
+        project_created=datetime.utcnow(),
+    )
     result = await storage.fetchrow(query)
 
     response = ResponseProject(result=result)
@@ -35,10 +46,13 @@ async def read(
     data: RequestProjectRead = data or request["data"]
     storage: AsyncpgsaStorage = request.app["Storage"]
 
-    query = project.select().where(project.c.id.in_(data.params))
+    query = project_select(project_ids=data.params)
 
     result = await storage.fetch(query)
-    response = ResponseProjectSeveral(result=result)
+    # Rows come from the database, so validation is skipped
+    response = ResponseProjectSeveral.construct(
+        result=records_to_models(Project, result)
+    )
 
     return response
 
@@ -53,14 +67,10 @@ async def update(
     data: RequestProjectUpdate = data or request["data"]
     storage: AsyncpgsaStorage = request.app["Storage"]
 
-    values = data.params.dict()
-    values.pop("id")
-
-    query = (
-        project.update()
-        .where(project.c.id == data.params.id)
-        .values(**values)
-        .returning(sa.literal_column("*"))
+    query = project_update(
+        project_id=data.params.id,
+        project_name=data.params.name,
+        project_updated=datetime.utcnow(),
     )
 
     result = await storage.fetchrow(query)
@@ -78,7 +88,7 @@ async def delete(
     data: RequestProjectDelete = data or request["data"]
     storage: AsyncpgsaStorage = request.app["Storage"]
 
-    query = project.delete().where(project.c.id.in_(data.params))
+    query = project_delete(project_ids=data.params)
 
     await storage.fetch(query)
 
@@ -95,34 +105,21 @@ async def lst(
     data: RequestProjectList = data or request["data"]
     storage: AsyncpgsaStorage = request.app["Storage"]
 
-    params = data.dict(exclude_unset=True)["params"]
-
-    query = project.select()
+    params = data.params
 
-    # Time
-    if "created_gt" in params:
-        query = query.where(
-            project.c.created > params["created_gt"].replace(tzinfo=None)
-        )
-
-    if "created_lt" in params:
-        query = query.where(
-            project.c.created < params["created_lt"].replace(tzinfo=None)
-        )
-
-    if "updated_gt" in params:
-        query = query.where(
-            project.c.updated > params["updated_gt"].replace(tzinfo=None)
-        )
-
-    if "updated_lt" in params:
-        query = query.where(
-            project.c.updated < params["updated_lt"].replace(tzinfo=None)
-        )
-
-    query = query.order_by(project.c.created.desc())
+    # Time filters, only the ones set in the request are used.
+    # Filters sent as null are skipped, comparison with NULL matches no rows
+    values = {
+        name: getattr(params, name)
+        for name in params.__fields_set__
+        if getattr(params, name) is not None
+    }
+    query = project_list(tuple(sorted(values)))(**values)
 
     result = await storage.fetch(query)
-    response = ResponseProjectSeveral(result=result)
+    # Rows come from the database, so validation is skipped
+    response = ResponseProjectSeveral.construct(
+        result=records_to_models(Project, result)
+    )
 
     return response
@@ -1,32 +1,26 @@
-from pathlib import Path
+import asyncio
 
 import aiojobs.aiohttp
 import sentry_sdk
+import uvloop
 from aiohttp import web
 from aiohttp_swagger import setup_swagger
 from sentry_sdk.integrations.aiohttp import AioHttpIntegration
 
-from alembic import command
-from alembic.config import Config as AConfig
-
 from service.middleware.logger import ELKAsync
 from service.middleware.middleware import MiddlewareMain
 from service.database.connector import AsyncpgsaStorage
 from service.swagger.swagger import get_definitions
 
 from service.config import Config
+from service.migrate import migrate
 from service.data_classes import project
 from service.routes import get_routes_misc, get_routes_v1
 
 
 async def on_startup(app: web.Application) -> None:
-    # Alembic
-    alembic_config = AConfig(Path(__file__).parent.parent / "alembic.ini")
-    alembic_config.set_main_option(
-        "script_location", str(Path(__file__).parent.parent / "alembic")
-    )
-    alembic_config.set_main_option("sqlalchemy.url", Config.POSTGRES_DSN)
-    command.upgrade(alembic_config, "head")
+    # Alembic is synchronous, so it is run outside of the event loop
+    await asyncio.get_event_loop().run_in_executor(None, migrate)
 
 
 def get_app() -> web.Application:
@@ -46,7 +40,9 @@ def get_app() -> web.Application:
     api_v1.add_routes(get_routes_v1())
 
     # Adding on_startup and on_shutdown
-    api_v1.on_startup.append(on_startup)
+    # Migrations are usually run once during deploy: python -m service.migrate
+    if Config.RUN_MIGRATIONS_ON_STARTUP:
+        api_v1.on_startup.append(on_startup)
 
     # ELK
     api_v1["ELKAsync"] = ELKAsync(
@@ -56,6 +52,9 @@ def get_app() -> web.Application:
         service_name=Config.ELK_SERVICE_NAME,
         logger_name=Config.ELK_LOGGER_NAME,
         enable=Config.ELK_ENABLE,
+        queue_size=Config.ELK_QUEUE_SIZE,
+        flush_threshold=Config.ELK_FLUSH_THRESHOLD,
+        flush_interval=Config.ELK_FLUSH_INTERVAL,
     )
     api_v1.cleanup_ctx.append(api_v1["ELKAsync"].setup)
 
@@ -64,6 +63,12 @@ def get_app() -> web.Application:
         dsn=Config.POSTGRES_DSN,
         min_size=Config.POSTGRES_MIN_SIZE,
         max_size=Config.POSTGRES_MAX_SIZE,
+        max_inactive_connection_lifetime=(
+            Config.POSTGRES_MAX_INACTIVE_CONNECTION_LIFETIME
+        ),
+        statement_cache_size=Config.POSTGRES_STATEMENT_CACHE_SIZE,
+        max_cached_statement_lifetime=Config.POSTGRES_MAX_CACHED_STATEMENT_LIFETIME,
+        command_timeout=Config.POSTGRES_COMMAND_TIMEOUT,
         logger=api_v1["ELKAsync"],
     )
     api_v1.cleanup_ctx.append(api_v1["Storage"].setup)
@@ -93,6 +98,16 @@ def run_server():
     if Config.SENTRY_ENABLE and Config.SENTRY_DSN:
         sentry_sdk.init(dsn=Config.SENTRY_DSN, integrations=[AioHttpIntegration()])
 
+    # uvloop event loop is installed before the app creates any loop objects
+    uvloop.install()
+
     app = get_app()
 
-    web.run_app(app, host=Config.HOST, port=Config.PORT)
+    # Requests are logged by the middleware, aiohttp access log is not needed
+    web.run_app(
+        app,
+        host=Config.HOST,
+        port=Config.PORT,
+        access_log=None,
+        keepalive_timeout=75,
+    )
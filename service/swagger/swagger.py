@@ -1,8 +1,9 @@
 import importlib
 import pkgutil
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, List, Union
 
 from pydantic.schema import schema
 
@@ -38,7 +39,7 @@ def import_dataclasses(any_dataclass_module: Any) -> None:
         importlib.import_module(f".{name}", package_name)
 
 
-# Recursively get all subclasses of a class
+# Iteratively get all subclasses of a class
 def all_subclasses(cls) -> set:
     """
     Get all subclasses of a class.
@@ -46,9 +47,21 @@ def all_subclasses(cls) -> set:
     :param cls: class.
     :return: a set of subclasses.
     """
-    return set(cls.__subclasses__()).union(
-        [s for c in cls.__subclasses__() for s in all_subclasses(c)]
-    )
+    subclasses = set()
+    stack = [cls]
+
+    while stack:
+        for subclass in stack.pop().__subclasses__():
+            # Classes with several bases are visited once
+            if subclass not in subclasses:
+                subclasses.add(subclass)
+                stack.append(subclass)
+
+    return subclasses
+
+
+# Definitions are generated once per dataclasses' package
+definitions_cache: Dict[str, dict] = {}
 
 
 def get_definitions(any_dataclass_module: Any) -> dict:
@@ -73,19 +86,21 @@ def get_definitions(any_dataclass_module: Any) -> dict:
 
     :return: Swagger definitions.
     """
+    if any_dataclass_module.__name__ in definitions_cache:
+        return dict(definitions_cache[any_dataclass_module.__name__])
+
     import_dataclasses(any_dataclass_module)
 
     subclasses = all_subclasses(base.BaseClass)
 
     top_level_schema = schema(subclasses, ref_prefix="#/components/schemas/")
-    definitions = {
-        k: v
-        for k, v in sorted(
-            top_level_schema["definitions"].items(), key=lambda item: item[0]
-        )
-    }
+    definitions = dict(
+        sorted(top_level_schema["definitions"].items(), key=itemgetter(0))
+    )
 
-    return definitions
+    definitions_cache[any_dataclass_module.__name__] = definitions
+
+    return dict(definitions)
 
 
 @dataclass
@@ -141,11 +156,8 @@ def update_function_docstring_with_swagger(
         return_annotation = function.__annotations__["return"]
 
         # Union data annotation
-        try:
-            data_schema: str = (
-                f"$ref: '#/components/schemas/{data_annotation.__name__}'"
-            )
-        except Exception:
+        # typing.get_origin and typing.get_args are not available in Python 3.7
+        if getattr(data_annotation, "__origin__", None) is Union:
             data_schema: str = f"oneOf:\n"
             classes: tuple = data_annotation.__args__
 
@@ -154,6 +166,10 @@ def update_function_docstring_with_swagger(
                     "    " * 6
                     + f"  - $ref: '#/components/schemas/{single_class.__name__}'\n"
                 )
+        else:
+            data_schema: str = (
+                f"$ref: '#/components/schemas/{data_annotation.__name__}'"
+            )
 
         # Create a docstring
         new_docstring = f"""
@@ -0,0 +1,55 @@
+import pytest
+
+from service.database.connector import join_boundaries, row_splitter
+
+
+def split_on_repeated_keys(keys: tuple, values: tuple) -> list:
+    """Previous fetchfulljoin algorithm: a table starts on a repeated column."""
+    temp = [{}]
+    for key, value in zip(keys, values):
+        if key in temp[-1]:
+            temp.append({})
+
+        temp[-1][key] = value
+
+    return temp
+
+
+@pytest.mark.parametrize(
+    "keys",
+    [
+        ("id", "name"),
+        ("id", "name", "id", "name"),
+        ("id", "name", "id", "id"),
+        ("id", "name", "created", "id", "project_id", "name", "id"),
+        ("a", "b", "c", "b", "a", "c"),
+    ],
+)
+def test_row_splitter_matches_repeated_keys(keys):
+    values = tuple(range(len(keys)))
+
+    split = row_splitter(keys, join_boundaries(keys))
+
+    assert split(values) == split_on_repeated_keys(keys, values)
+
+
+def test_join_boundaries():
+    assert join_boundaries(("id", "name")) == ()
+    assert join_boundaries(("id", "name", "id", "id")) == (2, 3)
+
+
+def test_row_splitter_explicit_split_at():
+    keys = ("id", "name", "project_id", "value")
+
+    split = row_splitter(keys, (2,))
+
+    assert split((1, "name", 2, "value")) == [
+        {"id": 1, "name": "name"},
+        {"project_id": 2, "value": "value"},
+    ]
+
+
+def test_row_splitter_is_cached():
+    keys = ("id", "name", "id")
+
+    assert row_splitter(keys, (2,)) is row_splitter(keys, (2,))
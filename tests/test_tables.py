@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime
+
+from service.database.tables import (
+    project_insert,
+    project_list,
+    project_select,
+    project_update,
+)
+
+PROJECT_ID = uuid.uuid4()
+CREATED = datetime(2021, 1, 1)
+UPDATED = datetime(2021, 1, 2)
+
+
+def test_project_insert():
+    sql, args = project_insert(
+        project_id=PROJECT_ID, project_name="name", project_created=CREATED
+    )
+
+    assert sql == (
+        'INSERT INTO "Project" (id, name, created) VALUES ($1, $2, $3) RETURNING *'
+    )
+    assert args == (PROJECT_ID, "name", CREATED)
+
+
+def test_project_select():
+    project_ids = [str(PROJECT_ID)]
+
+    sql, args = project_select(project_ids=project_ids)
+
+    assert sql.endswith('WHERE "Project".id = any($1)')
+    assert args == (project_ids,)
+
+
+def test_project_update():
+    # Placeholders are numbered in SQL order, not in the order of arguments
+    sql, args = project_update(
+        project_id=PROJECT_ID, project_name="name", project_updated=UPDATED
+    )
+
+    assert sql == (
+        'UPDATE "Project" SET name=$1, updated=$2 WHERE "Project".id = $3 RETURNING *'
+    )
+    assert args == ("name", UPDATED, PROJECT_ID)
+
+
+def test_project_list():
+    sql, args = project_list(("created_gt", "updated_lt"))(
+        updated_lt=UPDATED, created_gt=CREATED
+    )
+
+    assert " ".join(sql.split()).endswith(
+        'WHERE "Project".created > $1 AND "Project".updated < $2 '
+        'ORDER BY "Project".created DESC'
+    )
+    assert args == (CREATED, UPDATED)
+
+
+def test_project_list_without_filters():
+    sql, args = project_list(())()
+
+    assert "WHERE" not in sql
+    assert sql.endswith('ORDER BY "Project".created DESC')
+    assert args == ()